@@ -3,6 +3,7 @@
 #   python main.py --policy fixed --duration 600 --out results
 #   python main.py --policy duty --out results
 #   python main.py --policy adaptive --out results
+#   python main.py --sweep config_examples/sweep.json --out results_sweep
 #
 # On Windows PowerShell:
 #   python .\main.py --policy adaptive --out results
@@ -12,22 +13,36 @@ from __future__ import annotations
 import argparse
 import json
 import os
-from dataclasses import asdict
+from dataclasses import fields
+
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
 
 from sensor_sim.models import EnergyModel, NodeConfig
 from sensor_sim.policies import FixedSamplingPolicy, DutyCyclingPolicy, AdaptiveThresholdPolicy
-from sensor_sim.simulator import simulate
-from sensor_sim.plotting import save_plots
+from sensor_sim.simulator import simulate, simulate_batch
+from sensor_sim.plotting import plotting_available, save_plots
+
+
+_CONFIG_KEYS = frozenset(f.name for f in fields(NodeConfig))
+
+
+POLICY_CHOICES = ("fixed", "duty", "adaptive")
 
 
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Energy-Aware Sensor Node Simulator")
-    p.add_argument("--policy", choices=["fixed", "duty", "adaptive"], default="adaptive",
+    p.add_argument("--policy", choices=POLICY_CHOICES, default="adaptive",
                    help="Which strategy/policy to simulate.")
     p.add_argument("--duration", type=int, default=600, help="Simulation duration in seconds.")
     p.add_argument("--out", default="results", help="Output directory for reports and plots.")
     p.add_argument("--seed", type=int, default=42, help="Random seed.")
     p.add_argument("--config", default="", help="Optional JSON config file path (overrides flags).")
+    p.add_argument("--no-plots", action="store_true", help="Skip plotting (faster headless runs).")
+    p.add_argument("--sweep", default="",
+                   help="JSON file with a list of configs to run as a batch (each may set \"policy\").")
     return p.parse_args()
 
 
@@ -36,20 +51,24 @@ def load_cfg(args: argparse.Namespace) -> NodeConfig:
     if args.config:
         with open(args.config, "r", encoding="utf-8") as f:
             data = json.load(f)
-        # only accept known keys
-        d = asdict(cfg)
-        for k, v in data.items():
-            if k in d:
-                d[k] = v
-        cfg = NodeConfig(**d)
+        cfg = apply_overrides(cfg, data)
     return cfg
 
 
-def build_policy(args: argparse.Namespace, cfg: NodeConfig):
-    if args.policy == "fixed":
+def apply_overrides(cfg: NodeConfig, data: dict) -> NodeConfig:
+    # only accept known keys
+    d = cfg.to_dict()
+    for k, v in data.items():
+        if k in _CONFIG_KEYS:
+            d[k] = v
+    return NodeConfig(**d)
+
+
+def build_policy(policy: str, cfg: NodeConfig):
+    if policy == "fixed":
         # sample+tx every 5s
         return FixedSamplingPolicy(sample_every_s=5)
-    if args.policy == "duty":
+    if policy == "duty":
         # wake every 10s, stay awake 2s, and sample every 5s
         return DutyCyclingPolicy(wake_every_s=10, awake_window_s=2, sample_every_s=5)
     # adaptive default
@@ -60,36 +79,90 @@ def build_policy(args: argparse.Namespace, cfg: NodeConfig):
     )
 
 
+def write_report(report: dict, path: str) -> None:
+    """Write the JSON report, using orjson when it is installed."""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+
+def summarize(cfg: NodeConfig, result) -> dict:
+    return {
+        "duration_s": cfg.duration_s,
+        "samples_taken": result.samples_taken,
+        "packets_sent": result.packets_sent,
+        "mae": result.mae,
+        "energy_total_mj": result.energy_total_mj,
+        "energy_breakdown_mj": result.energy_breakdown_mj,
+    }
+
+
+def run_sweep(args: argparse.Namespace, base_cfg: NodeConfig, energy: EnergyModel) -> int:
+    with open(args.sweep, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    if not isinstance(entries, list):
+        raise SystemExit(f"{args.sweep}: expected a JSON list of config objects")
+    for i, e in enumerate(entries):
+        if not isinstance(e, dict):
+            raise SystemExit(f"{args.sweep}: entry {i} is not a JSON object")
+        if e.get("policy", args.policy) not in POLICY_CHOICES:
+            raise SystemExit(
+                f"{args.sweep}: entry {i} has unknown policy {e['policy']!r} "
+                f"(choose from {', '.join(POLICY_CHOICES)})"
+            )
+
+    cfgs = [apply_overrides(base_cfg, e) for e in entries]
+    policies = [build_policy(e.get("policy", args.policy), c) for e, c in zip(entries, cfgs)]
+    results = simulate_batch(policies, cfgs, [energy] * len(cfgs))
+
+    os.makedirs(args.out, exist_ok=True)
+    report = {
+        "energy_model": energy.to_dict(),
+        "runs": [
+            {"policy": p.name, "config": c.to_dict(), "summary": summarize(c, r)}
+            for p, c, r in zip(policies, cfgs, results)
+        ],
+    }
+    report_path = os.path.join(args.out, "report.json")
+    write_report(report, report_path)
+
+    print("=== Energy-Aware Sensor Node Simulator (sweep) ===")
+    for p, c, r in zip(policies, cfgs, results):
+        print(f"{p.name}  seed={c.seed}  duration={c.duration_s}s  "
+              f"MAE={r.mae:.3f}  energy={r.energy_total_mj:.1f} mJ  packets={r.packets_sent}")
+    print(f"\nSaved report: {report_path}")
+    return 0
+
+
 def main() -> int:
     args = parse_args()
     cfg = load_cfg(args)
     energy = EnergyModel()
-    policy = build_policy(args, cfg)
+    if args.sweep:
+        return run_sweep(args, cfg, energy)
+    policy = build_policy(args.policy, cfg)
 
     os.makedirs(args.out, exist_ok=True)
-    result = simulate(policy, cfg, energy)
+    # Per-step history is only needed for plotting
+    want_plots = not args.no_plots and plotting_available()
+    result = simulate(policy, cfg, energy, include_history=want_plots)
 
     # Save a JSON report
     report = {
         "policy": policy.name,
-        "config": asdict(cfg),
-        "energy_model": asdict(energy),
-        "summary": {
-            "duration_s": cfg.duration_s,
-            "samples_taken": result.samples_taken,
-            "packets_sent": result.packets_sent,
-            "mae": result.mae,
-            "energy_total_mj": result.energy_total_mj,
-            "energy_breakdown_mj": result.energy_breakdown_mj,
-        }
+        "config": cfg.to_dict(),
+        "energy_model": energy.to_dict(),
+        "summary": summarize(cfg, result),
     }
     report_path = os.path.join(args.out, "report.json")
-    with open(report_path, "w", encoding="utf-8") as f:
-        json.dump(report, f, indent=2)
+    write_report(report, report_path)
 
     # Save plots (optional; safe if matplotlib missing)
     plot_dir = os.path.join(args.out, "plots")
-    plots = save_plots(result, plot_dir, title=policy.name)
+    plots = save_plots(result, plot_dir, title=policy.name) if want_plots else []
 
     print("=== Energy-Aware Sensor Node Simulator ===")
     print(f"Policy: {policy.name}")
@@ -105,6 +178,8 @@ def main() -> int:
     print(f"\nSaved report: {report_path}")
     if plots:
         print(f"Saved plots in: {plot_dir}")
+    elif args.no_plots:
+        print("Plots skipped (--no-plots).")
     else:
         print("Plots skipped (matplotlib not available).")
 
@@ -1,7 +1,47 @@
 """Basic sanity check to ensure the simulator runs without errors."""
+from dataclasses import fields
+
+import numpy as np
+
 from sensor_sim.models import EnergyModel, NodeConfig
-from sensor_sim.policies import FixedSamplingPolicy, DutyCyclingPolicy, AdaptiveThresholdPolicy
-from sensor_sim.simulator import simulate
+from sensor_sim.policies import AWAKE, TAKE_SAMPLE, TRANSMIT, BasePolicy, FixedSamplingPolicy, DutyCyclingPolicy, AdaptiveThresholdPolicy
+from sensor_sim.simulator import simulate, simulate_batch
+
+class SilentAdaptive(AdaptiveThresholdPolicy):
+    def step(self, t_s, last_measurement, last_tx_s):
+        return super().step(t_s, last_measurement, last_tx_s) & ~TRANSMIT
+
+class SilentFixed(FixedSamplingPolicy):
+    def step(self, t_s, last_measurement, last_tx_s):
+        return super().step(t_s, last_measurement, last_tx_s) & ~TRANSMIT
+
+class SilentMixin:
+    def step(self, t_s, last_measurement, last_tx_s):
+        return super().step(t_s, last_measurement, last_tx_s) & ~TRANSMIT
+
+class SilentMixedAdaptive(SilentMixin, AdaptiveThresholdPolicy):
+    pass
+
+class SilentMixedDuty(SilentMixin, DutyCyclingPolicy):
+    pass
+
+class OffsetTx(BasePolicy):
+    """Samples every 5s but transmits at t % 10 == 3, between samples."""
+    def step(self, t_s, last_measurement, last_tx_s):
+        assert last_measurement is None or type(last_measurement) is float
+        flags = AWAKE
+        if t_s % 5 == 0:
+            flags |= TAKE_SAMPLE
+        if t_s % 10 == 3:
+            flags |= TRANSMIT
+        return flags
+
+    def schedule(self, t_s):
+        return t_s >= 0, t_s % 5 == 0, t_s % 10 == 3
+
+class SteppedOffsetTx(OffsetTx):
+    def schedule(self, t_s):
+        return None
 
 def run():
     cfg = NodeConfig(duration_s=60, seed=1)
@@ -11,10 +51,66 @@ def run():
         DutyCyclingPolicy(wake_every_s=10, awake_window_s=2, sample_every_s=5),
         AdaptiveThresholdPolicy(base_every_s=2, threshold=0.5, max_silence_s=30),
     ]:
-        r = simulate(pol, cfg, energy)
+        r = simulate(pol, cfg, energy, include_history=True)
         assert r.energy_total_mj > 0
         assert len(r.t) == len(r.truth) == len(r.reconstructed)
 
+        # Summary-only mode keeps the same aggregates without the series
+        s = simulate(pol, cfg, energy, include_history=False)
+        assert s.t is None and s.reconstructed is None
+        assert (s.samples_taken, s.packets_sent) == (r.samples_taken, r.packets_sent)
+        assert abs(s.energy_total_mj - r.energy_total_mj) < 1e-6
+        assert abs(s.mae - r.mae) < 1e-9
+
+        # The storage dtype must not change the random stream
+        d = simulate(pol, cfg, energy, dtype=np.float64)
+        assert (d.samples_taken, d.packets_sent) == (r.samples_taken, r.packets_sent)
+        assert abs(d.mae - r.mae) < 1e-3
+
+    # to_dict() covers every field (apply_overrides rebuilds configs from it)
+    for model in (EnergyModel(), cfg):
+        assert set(model.to_dict()) == {f.name for f in fields(model)}
+
+    # Negative seeds are accepted, as with the stdlib random.seed()
+    neg = NodeConfig(duration_s=60, seed=-1)
+    for pol in [FixedSamplingPolicy(sample_every_s=5), AdaptiveThresholdPolicy(base_every_s=2)]:
+        assert simulate(pol, neg, energy).samples_taken > 0
+
+    # A negative duration gives an empty run, not a crash
+    for duration in (-5, -60):
+        empty_cfg = NodeConfig(duration_s=duration, seed=1)
+        for pol in [
+            FixedSamplingPolicy(sample_every_s=5),
+            DutyCyclingPolicy(wake_every_s=10, awake_window_s=2, sample_every_s=5),
+            AdaptiveThresholdPolicy(base_every_s=2, threshold=0.5, max_silence_s=30),
+        ]:
+            for history in (True, False):
+                r = simulate(pol, empty_cfg, energy, include_history=history)
+                assert r.energy_total_mj == 0 and r.mae == 0
+                assert r.samples_taken == r.packets_sent == 0
+
+    # Subclasses that override step() are stepped, not sent down a fast path
+    for pol in [SilentAdaptive(), SilentFixed(), SilentMixedAdaptive(), SilentMixedDuty()]:
+        r = simulate(pol, cfg, energy)
+        assert r.samples_taken > 0 and r.packets_sent == 0
+        assert simulate_batch([pol], [cfg], [energy])[0].packets_sent == 0
+
+    # A schedule() matches step(), including transmits between samples
+    r = simulate(OffsetTx(), cfg, energy)
+    s = simulate(SteppedOffsetTx(), cfg, energy)
+    assert r.packets_sent == s.packets_sent > 0
+    assert abs(r.mae - s.mae) < 1e-6
+    assert (r.reconstructed == s.reconstructed).all()
+
+    # Batched runs match individual runs, in input order
+    pols = [AdaptiveThresholdPolicy(base_every_s=2), FixedSamplingPolicy(sample_every_s=5)] * 2
+    cfgs = [NodeConfig(duration_s=d, seed=s) for d, s in ((60, 1), (60, 1), (-5, 2), (60, 2))]
+    batch = simulate_batch(pols, cfgs, [energy] * len(pols))
+    for pol, c, b in zip(pols, cfgs, batch):
+        r = simulate(pol, c, energy, include_history=False)
+        assert (b.samples_taken, b.packets_sent) == (r.samples_taken, r.packets_sent)
+        assert abs(b.mae - r.mae) < 1e-9
+
 if __name__ == "__main__":
     run()
     print("Self-test OK")
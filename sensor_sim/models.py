@@ -2,6 +2,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Optional
 
+import numpy as np
+
 
 @dataclass(frozen=True)
 class EnergyModel:
@@ -43,6 +45,19 @@ class EnergyModel:
         t_tx = self.tx_overhead_s + (bits / self.bitrate_bps)
         return self.power_tx_mw * t_tx
 
+    def to_dict(self) -> dict:
+        return {
+            "power_sleep_mw": self.power_sleep_mw,
+            "power_idle_awake_mw": self.power_idle_awake_mw,
+            "power_cpu_mw": self.power_cpu_mw,
+            "power_sense_mw": self.power_sense_mw,
+            "power_tx_mw": self.power_tx_mw,
+            "t_sense_s": self.t_sense_s,
+            "t_cpu_s": self.t_cpu_s,
+            "bitrate_bps": self.bitrate_bps,
+            "tx_overhead_s": self.tx_overhead_s,
+        }
+
 
 @dataclass(frozen=True)
 class NodeConfig:
@@ -63,15 +78,34 @@ class NodeConfig:
     change_threshold: float = 0.5
     max_silence_s: int = 30
 
+    def to_dict(self) -> dict:
+        return {
+            "duration_s": self.duration_s,
+            "dt_s": self.dt_s,
+            "payload_bytes": self.payload_bytes,
+            "seed": self.seed,
+            "signal_base": self.signal_base,
+            "signal_amp": self.signal_amp,
+            "signal_period_s": self.signal_period_s,
+            "noise_std": self.noise_std,
+            "change_threshold": self.change_threshold,
+            "max_silence_s": self.max_silence_s,
+        }
+
 
 @dataclass
 class SimResult:
-    """Simulation outputs."""
-    t: list[float]
-    truth: list[float]
-    measured: list[Optional[float]]
-    sent: list[bool]
-    reconstructed: list[float]
+    """Simulation outputs.
+
+    Per-step series are NumPy arrays of equal length; `measured` holds NaN
+    on steps where no sample was taken. They are None when the simulation
+    was run with include_history=False.
+    """
+    t: Optional[np.ndarray]
+    truth: Optional[np.ndarray]
+    measured: Optional[np.ndarray]
+    sent: Optional[np.ndarray]
+    reconstructed: Optional[np.ndarray]
 
     energy_total_mj: float
     energy_breakdown_mj: dict[str, float]
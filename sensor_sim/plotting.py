@@ -4,55 +4,65 @@ import os
 
 from .models import SimResult
 
+PLOT_DPI = 100
+
 
 def _try_import_matplotlib():
+    # Use the Figure API directly: it renders through Agg without importing
+    # pyplot or probing for a GUI backend, which dominates short runs.
     try:
-        import matplotlib.pyplot as plt  # type: ignore
-        return plt
+        from matplotlib.figure import Figure  # type: ignore
+        return Figure
     except Exception:
         return None
 
 
+def plotting_available() -> bool:
+    """True if matplotlib can be imported (so save_plots will draw)."""
+    return _try_import_matplotlib() is not None
+
+
 def save_plots(result: SimResult, out_dir: str, title: str) -> list[str]:
     """Save plots to out_dir.
 
-    This function is safe even if matplotlib is not installed:
-    it will simply return an empty list.
+    This function is safe even if matplotlib is not installed, or if the
+    result was simulated without history: it will simply return an empty list.
     """
-    plt = _try_import_matplotlib()
-    if plt is None:
+    Figure = _try_import_matplotlib()
+    if Figure is None or result.t is None:
         return []
 
     os.makedirs(out_dir, exist_ok=True)
     paths: list[str] = []
 
+    # One figure is reused for both plots
+    fig = Figure()
+    ax = fig.add_subplot()
+
     # Plot 1: truth vs reconstructed
-    plt.figure()
-    plt.plot(result.t, result.truth, label="Ground truth")
-    plt.plot(result.t, result.reconstructed, label="Reconstructed (what receiver sees)")
-    plt.xlabel("Time (s)")
-    plt.ylabel("Signal value")
-    plt.title(f"{title} — Signal")
-    plt.legend()
+    ax.plot(result.t, result.truth, label="Ground truth")
+    ax.plot(result.t, result.reconstructed, label="Reconstructed (what receiver sees)")
+    ax.set_xlabel("Time (s)")
+    ax.set_ylabel("Signal value")
+    ax.set_title(f"{title} — Signal")
+    ax.legend()
     p1 = os.path.join(out_dir, "signal.png")
-    plt.tight_layout()
-    plt.savefig(p1, dpi=160)
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(p1, dpi=PLOT_DPI)
     paths.append(p1)
 
     # Plot 2: cumulative energy
     # Reconstruct cumulative energy using breakdown proportions per step is complex;
     # instead show energy breakdown as bar chart + total scalar.
-    plt.figure()
+    ax.clear()
     labels = list(result.energy_breakdown_mj.keys())
     values = [result.energy_breakdown_mj[k] for k in labels]
-    plt.bar(labels, values)
-    plt.ylabel("Energy (mJ)")
-    plt.title(f"{title} — Energy breakdown (Total: {result.energy_total_mj:.1f} mJ)")
+    ax.bar(labels, values)
+    ax.set_ylabel("Energy (mJ)")
+    ax.set_title(f"{title} — Energy breakdown (Total: {result.energy_total_mj:.1f} mJ)")
     p2 = os.path.join(out_dir, "energy_breakdown.png")
-    plt.tight_layout()
-    plt.savefig(p2, dpi=160)
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(p2, dpi=PLOT_DPI)
     paths.append(p2)
 
     return paths
@@ -1,13 +1,13 @@
 from __future__ import annotations
-from dataclasses import dataclass
 from typing import Optional
 
+import numpy as np
 
-@dataclass(frozen=True)
-class PolicyOutput:
-    awake: bool
-    take_sample: bool
-    transmit: bool
+
+# Bit flags returned by BasePolicy.step()
+AWAKE = 1
+TAKE_SAMPLE = 2
+TRANSMIT = 4
 
 
 class BasePolicy:
@@ -17,9 +17,22 @@ class BasePolicy:
     def reset(self) -> None:
         pass
 
-    def step(self, t_s: int, last_measurement: Optional[float], last_tx_s: Optional[int]) -> PolicyOutput:
+    def step(self, t_s: int, last_measurement: Optional[float], last_tx_s: Optional[int]) -> int:
+        """Return an OR of AWAKE / TAKE_SAMPLE / TRANSMIT for this step."""
         raise NotImplementedError
 
+    def schedule(self, t_s: np.ndarray) -> Optional[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Return (awake, take_sample, transmit) bool masks for the whole run.
+
+        Only policies whose decisions are a closed-form function of time can
+        do this; the default returns None, meaning "step sequentially". The
+        masks mean the same as step()'s flags: a transmit sends the latest
+        sample taken so far, even if this step takes none. The
+        simulator only uses a schedule() defined on the same class as the
+        policy's step(), so a subclass overriding step() is stepped.
+        """
+        return None
+
 
 class FixedSamplingPolicy(BasePolicy):
     """Always awake; sample and transmit every N seconds."""
@@ -27,9 +40,14 @@ class FixedSamplingPolicy(BasePolicy):
         self.sample_every_s = max(1, int(sample_every_s))
         self.name = f"fixed_{self.sample_every_s}s"
 
-    def step(self, t_s: int, last_measurement: Optional[float], last_tx_s: Optional[int]) -> PolicyOutput:
+    def step(self, t_s: int, last_measurement: Optional[float], last_tx_s: Optional[int]) -> int:
+        if t_s % self.sample_every_s == 0:
+            return AWAKE | TAKE_SAMPLE | TRANSMIT
+        return AWAKE
+
+    def schedule(self, t_s: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
         do = (t_s % self.sample_every_s == 0)
-        return PolicyOutput(awake=True, take_sample=do, transmit=do)
+        return np.ones_like(do), do, do
 
 
 class DutyCyclingPolicy(BasePolicy):
@@ -45,11 +63,18 @@ class DutyCyclingPolicy(BasePolicy):
         self.sample_every_s = max(1, int(sample_every_s))
         self.name = f"duty_w{self.wake_every_s}s_a{self.awake_window_s}s_s{self.sample_every_s}s"
 
-    def step(self, t_s: int, last_measurement: Optional[float], last_tx_s: Optional[int]) -> PolicyOutput:
+    def step(self, t_s: int, last_measurement: Optional[float], last_tx_s: Optional[int]) -> int:
         phase = t_s % self.wake_every_s
-        awake = (phase < self.awake_window_s)
-        do = awake and (t_s % self.sample_every_s == 0)
-        return PolicyOutput(awake=awake, take_sample=do, transmit=do)
+        if phase >= self.awake_window_s:
+            return 0
+        if t_s % self.sample_every_s == 0:
+            return AWAKE | TAKE_SAMPLE | TRANSMIT
+        return AWAKE
+
+    def schedule(self, t_s: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        awake = (t_s % self.wake_every_s) < self.awake_window_s
+        do = awake & (t_s % self.sample_every_s == 0)
+        return awake, do, do
 
 
 class AdaptiveThresholdPolicy(BasePolicy):
@@ -67,28 +92,33 @@ class AdaptiveThresholdPolicy(BasePolicy):
         self.max_silence_s = max(1, int(max_silence_s))
         self.name = f"adaptive_b{self.base_every_s}s_th{self.threshold}_ms{self.max_silence_s}s"
 
-        self._last_tx_value: Optional[float] = None
+        # Last transmitted value, valid only while _has_last_tx is True
+        self._has_last_tx = False
+        self._last_tx_value = 0.0
 
     def reset(self) -> None:
-        self._last_tx_value = None
+        self._has_last_tx = False
+        self._last_tx_value = 0.0
 
-    def step(self, t_s: int, last_measurement: Optional[float], last_tx_s: Optional[int]) -> PolicyOutput:
+    def step(self, t_s: int, last_measurement: Optional[float], last_tx_s: Optional[int]) -> int:
         take_sample = (t_s % self.base_every_s == 0)
         transmit = False
 
         # Only decide about transmit if we are sampling now and have a measurement
         if take_sample and last_measurement is not None:
-            if self._last_tx_value is None:
-                transmit = True
-            else:
-                if abs(last_measurement - self._last_tx_value) >= self.threshold:
-                    transmit = True
+            transmit = (not self._has_last_tx) or abs(last_measurement - self._last_tx_value) >= self.threshold
 
             if not transmit and last_tx_s is not None:
                 if (t_s - last_tx_s) >= self.max_silence_s:
                     transmit = True
 
             if transmit:
+                self._has_last_tx = True
                 self._last_tx_value = last_measurement
 
-        return PolicyOutput(awake=True, take_sample=take_sample, transmit=transmit)
+        flags = AWAKE
+        if take_sample:
+            flags |= TAKE_SAMPLE
+        if transmit:
+            flags |= TRANSMIT
+        return flags
@@ -1,100 +1,294 @@
 from __future__ import annotations
 import math
-import random
-from typing import Optional
+from typing import Optional, Sequence
+
+import numpy as np
+from numpy.typing import DTypeLike
 
 from .models import EnergyModel, NodeConfig, SimResult
-from .policies import BasePolicy
+from .policies import (
+    AWAKE,
+    TAKE_SAMPLE,
+    TRANSMIT,
+    AdaptiveThresholdPolicy,
+    BasePolicy,
+)
 
+try:
+    from numba import njit, prange, vectorize  # type: ignore
+except Exception:
+    # numba is optional: without it the kernels below run as plain Python
+    # (and the ufuncs as plain NumPy expressions).
+    prange = range
 
-def ground_truth(t_s: int, cfg: NodeConfig) -> float:
-    # A smooth periodic signal with mild drift-like variation
-    w = (2 * math.pi) / max(1.0, cfg.signal_period_s)
-    return cfg.signal_base + cfg.signal_amp * math.sin(w * t_s) + 0.25 * math.sin(w * 0.33 * t_s)
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
 
+    def vectorize(*args, **kwargs):
+        return lambda fn: fn
 
-def simulate(policy: BasePolicy, cfg: NodeConfig, energy: EnergyModel) -> SimResult:
-    """Run the simulation.
 
-    Notes:
-    - Discrete time simulation with step dt_s (default 1s).
-    - When the node is asleep, no sensing/CPU/tx occurs.
-    - Energy is accumulated per time step + per action.
+@vectorize(["float64(float64, float64, float64, float64)"], target="cpu", cache=True)
+def _truth_ufunc(t, base, amp, w):
+    # A smooth periodic signal with mild drift-like variation.
+    # np.sin keeps the body valid both as a numba ufunc kernel and as a
+    # plain NumPy expression.
+    return base + amp * np.sin(w * t) + 0.25 * np.sin(w * 0.33 * t)
+
+
+def _noise(cfg: NodeConfig, n: int, dtype: DTypeLike) -> np.ndarray:
+    """Sensor noise for every step of the run, drawn in one batch.
+
+    Steps that take no sample simply ignore their entry, so a given seed
+    yields the same noise at the same time step for every policy. The draw
+    is always float64 and only the stored result is narrowed, so `dtype`
+    does not change the random stream.
     """
-    random.seed(cfg.seed)
-    policy.reset()
+    # default_rng rejects negative seeds; wrap them into the 64-bit range
+    rng = np.random.default_rng(cfg.seed & 0xFFFFFFFFFFFFFFFF)
+    noise = rng.standard_normal(n)
+    noise *= cfg.noise_std
+    return noise.astype(dtype, copy=False)
 
-    t: list[float] = []
-    truth: list[float] = []
-    measured: list[Optional[float]] = []
-    sent: list[bool] = []
-    reconstructed: list[float] = []
 
-    # Energy bookkeeping
-    e_sleep = 0.0
-    e_idle = 0.0
-    e_sense = 0.0
-    e_cpu = 0.0
-    e_tx = 0.0
+def _signal(cfg: NodeConfig, t_s: np.ndarray, dtype: DTypeLike) -> tuple[np.ndarray, np.ndarray, float]:
+    """Return (truth, noise, truth0) for the whole run, stored as `dtype`.
+
+    truth0 is the signal at t=0, what the receiver sees before the first
+    transmission; it is evaluated directly so it exists even for an empty
+    run. The sine is always evaluated in float64 (w*t grows large on long
+    runs) and only the stored result is narrowed.
+    """
+    w = math.tau / max(1.0, cfg.signal_period_s)
+    truth = _truth_ufunc(t_s.astype(np.float64), cfg.signal_base, cfg.signal_amp, w)
+    truth0 = _truth_ufunc(np.zeros(1), cfg.signal_base, cfg.signal_amp, w).astype(dtype)[0]
+    return truth.astype(dtype, copy=False), _noise(cfg, len(t_s), dtype), truth0
 
-    last_measurement: Optional[float] = None
-    last_tx_value: Optional[float] = None
-    last_tx_s: Optional[int] = None
+
+def _mae(truth: np.ndarray, reconstructed: np.ndarray) -> float:
+    """Mean absolute error, computed in a single scratch buffer."""
+    if len(truth) == 0:
+        return 0.0
+    err = np.subtract(truth, reconstructed)
+    np.abs(err, out=err)
+    return float(err.mean(dtype=np.float64))
+
+
+def _last_index(mask: np.ndarray) -> np.ndarray:
+    """Index of the latest set entry of mask at or before each step (-1 if none)."""
+    idx = np.where(mask, np.arange(len(mask)), -1)
+    np.maximum.accumulate(idx, out=idx)
+    return idx
+
+
+def _forward_fill(values: np.ndarray, mask: np.ndarray, initial: float) -> np.ndarray:
+    """Carry values[i] forward from every step where mask[i] is set.
+
+    Steps before the first set entry get `initial`.
+    """
+    idx = _last_index(mask)
+    return np.where(idx >= 0, values[idx], initial).astype(values.dtype, copy=False)
+
+
+def _make_result(
+    t_s: Optional[np.ndarray],
+    truth: Optional[np.ndarray],
+    measured: Optional[np.ndarray],
+    sent: Optional[np.ndarray],
+    reconstructed: Optional[np.ndarray],
+    breakdown: dict[str, float],
+    samples_taken: int,
+    packets_sent: int,
+    mae: float,
+) -> SimResult:
+    return SimResult(
+        t=t_s,
+        truth=truth,
+        measured=measured,
+        sent=sent,
+        reconstructed=reconstructed,
+        energy_total_mj=sum(breakdown.values()),
+        energy_breakdown_mj=breakdown,
+        samples_taken=int(samples_taken),
+        packets_sent=int(packets_sent),
+        mae=float(mae),
+    )
+
+
+@njit(cache=True, fastmath=True)
+def _simulate_adaptive_core(
+    t_s,
+    truth,
+    noise,
+    base_every_s,
+    threshold,
+    max_silence_s,
+    recon0,
+    record,
+):
+    """Sequential scan for AdaptiveThresholdPolicy.
+
+    Mirrors AdaptiveThresholdPolicy.step + the simulate loop using only
+    arrays and scalars so it can be compiled by numba. Only the sample and
+    packet counts are tracked per step; energy follows from them (the node
+    is always awake).
+
+    With `record` the per-step transmit mask is returned and everything else
+    is rebuilt from it with array ops; otherwise the mask is empty and the
+    absolute reconstruction error is summed in the same pass instead.
+    """
+    n = t_s.shape[0]
+    sent = np.zeros(n if record else 0, dtype=np.bool_)
 
     samples_taken = 0
     packets_sent = 0
+    abs_err_sum = np.float64(0.0)  # float32 inputs must not narrow the sum
 
-    # reconstruction: start at truth(0)
-    recon_val = ground_truth(0, cfg)
+    has_measurement = False
+    last_measurement = 0.0
+    has_last_tx_value = False
+    last_tx_value = 0.0
+    has_last_tx_s = False
+    last_tx_s = 0
+    recon_val = recon0
 
-    steps = int(cfg.duration_s / cfg.dt_s)
-    for i in range(steps + 1):
-        now_s = int(round(i * cfg.dt_s))
-        t.append(now_s)
+    for i in range(n):
+        now_s = t_s[i]
+        take_sample = (now_s % base_every_s == 0)
+        transmit = False
+        if take_sample:
+            # Policy decision (uses the measurement from the previous sample)
+            if has_measurement:
+                transmit = (not has_last_tx_value) or abs(last_measurement - last_tx_value) >= threshold
+                if not transmit and has_last_tx_s and (now_s - last_tx_s) >= max_silence_s:
+                    transmit = True
+                if transmit:
+                    has_last_tx_value = True
+                    last_tx_value = last_measurement
 
-        gt = ground_truth(now_s, cfg)
-        truth.append(gt)
+            last_measurement = truth[i] + noise[i]
+            has_measurement = True
+            samples_taken += 1
 
-        out = policy.step(now_s, last_measurement, last_tx_s)
+            if transmit:
+                packets_sent += 1
+                has_last_tx_s = True
+                last_tx_s = now_s
+                recon_val = last_measurement
 
-        if out.awake:
-            e_idle += energy.e_idle_awake(cfg.dt_s)
+        if record:
+            sent[i] = transmit
         else:
-            e_sleep += energy.e_sleep(cfg.dt_s)
+            abs_err_sum += abs(truth[i] - recon_val)
 
-        mval: Optional[float] = None
-        did_tx = False
+    return sent, samples_taken, packets_sent, abs_err_sum
 
-        if out.awake and out.take_sample:
-            # Sense + CPU
-            noise = random.gauss(0.0, cfg.noise_std)
-            mval = gt + noise
-            last_measurement = mval
 
-            e_sense += energy.e_sense()
-            e_cpu += energy.e_cpu()
-            samples_taken += 1
+def _simulate_adaptive(
+    policy: AdaptiveThresholdPolicy,
+    cfg: NodeConfig,
+    energy: EnergyModel,
+    t_s: np.ndarray,
+    include_history: bool,
+    dtype: DTypeLike,
+) -> SimResult:
+    truth, noise, truth0 = _signal(cfg, t_s, dtype)
+    sent, samples_taken, packets_sent, abs_err_sum = _simulate_adaptive_core(
+        t_s,
+        truth,
+        noise,
+        policy.base_every_s,
+        policy.threshold,
+        policy.max_silence_s,
+        truth0,
+        include_history,
+    )
+    return _adaptive_result(
+        policy, cfg, energy, t_s, truth, noise, truth0, sent, samples_taken, packets_sent, abs_err_sum,
+        include_history,
+    )
+
+
+def _adaptive_result(
+    policy: AdaptiveThresholdPolicy,
+    cfg: NodeConfig,
+    energy: EnergyModel,
+    t_s: np.ndarray,
+    truth: np.ndarray,
+    noise: np.ndarray,
+    truth0: float,
+    sent: np.ndarray,
+    samples_taken: int,
+    packets_sent: int,
+    abs_err_sum: float,
+    include_history: bool,
+) -> SimResult:
+    """Turn the adaptive kernel's outputs into a SimResult."""
+    breakdown = {
+        "sleep": 0.0,
+        "idle_awake": len(t_s) * energy.e_idle_awake(cfg.dt_s),
+        "sensing": samples_taken * energy.e_sense(),
+        "cpu": samples_taken * energy.e_cpu(),
+        "tx": packets_sent * energy.e_tx(cfg.payload_bytes),
+    }
+    if not include_history:
+        mae = abs_err_sum / max(1, len(t_s))
+        return _make_result(None, None, None, None, None, breakdown, samples_taken, packets_sent, mae)
+
+    # Every transmit happens on a sample step and sends that step's reading
+    values = truth + noise
+    measured = np.where(t_s % policy.base_every_s == 0, values, np.nan)
+    reconstructed = _forward_fill(values, sent, truth0)
+    mae = _mae(truth, reconstructed)
+    return _make_result(t_s, truth, measured, sent, reconstructed, breakdown, samples_taken, packets_sent, mae)
+
+
+def _simulate_vectorized(
+    cfg: NodeConfig,
+    energy: EnergyModel,
+    t_s: np.ndarray,
+    awake: np.ndarray,
+    take_sample: np.ndarray,
+    transmit: np.ndarray,
+    include_history: bool,
+    dtype: DTypeLike,
+) -> SimResult:
+    """Whole-array simulation for policies with a fixed schedule.
+
+    As in the step loop, a transmit sends the latest sample taken so far
+    (not necessarily one from the same step) and is dropped while asleep or
+    before any sample exists. The reconstructed series is still built (the
+    MAE needs it), but `measured` is only materialized when include_history
+    is True.
+    """
+    n = len(t_s)
+    truth, noise, truth0 = _signal(cfg, t_s, dtype)
+    values = np.add(truth, noise, out=noise)  # what the sensor would read at each step
+
+    take_sample = awake & take_sample
+    transmit = awake & transmit
+    sent_values = values
+    if (transmit & ~take_sample).any():
+        # Some transmits fall between samples and resend the latest one
+        last_sample = _last_index(take_sample)
+        transmit &= last_sample >= 0
+        sent_values = values[last_sample]
+
+    # Before the first TX the receiver still sees truth(0)
+    reconstructed = _forward_fill(sent_values, transmit, truth0)
+
+    n_awake = int(awake.sum())
+    samples_taken = int(take_sample.sum())
+    packets_sent = int(transmit.sum())
+
+    e_sleep = (n - n_awake) * energy.e_sleep(cfg.dt_s)
+    e_idle = n_awake * energy.e_idle_awake(cfg.dt_s)
+    e_sense = samples_taken * energy.e_sense()
+    e_cpu = samples_taken * energy.e_cpu()
+    e_tx = packets_sent * energy.e_tx(cfg.payload_bytes)
 
-        if out.awake and out.transmit and (last_measurement is not None):
-            # Transmit latest measurement
-            e_tx += energy.e_tx(cfg.payload_bytes)
-            packets_sent += 1
-            last_tx_s = now_s
-            last_tx_value = last_measurement
-            recon_val = last_measurement
-            did_tx = True
-
-        measured.append(mval)
-        sent.append(did_tx)
-        reconstructed.append(recon_val)
-
-    # Data quality: MAE between truth and reconstructed
-    abs_err_sum = 0.0
-    for gt, rv in zip(truth, reconstructed):
-        abs_err_sum += abs(gt - rv)
-    mae = abs_err_sum / max(1, len(truth))
-
-    e_total = e_sleep + e_idle + e_sense + e_cpu + e_tx
     breakdown = {
         "sleep": e_sleep,
         "idle_awake": e_idle,
@@ -102,16 +296,220 @@ def simulate(policy: BasePolicy, cfg: NodeConfig, energy: EnergyModel) -> SimRes
         "cpu": e_cpu,
         "tx": e_tx,
     }
+    mae = _mae(truth, reconstructed)
+    if not include_history:
+        return _make_result(None, None, None, None, None, breakdown, samples_taken, packets_sent, mae)
+    measured = np.where(take_sample, values, np.nan)
+    return _make_result(t_s, truth, measured, transmit, reconstructed, breakdown, samples_taken, packets_sent, mae)
 
-    return SimResult(
-        t=t,
-        truth=truth,
-        measured=measured,
-        sent=sent,
-        reconstructed=reconstructed,
-        energy_total_mj=e_total,
-        energy_breakdown_mj=breakdown,
-        samples_taken=samples_taken,
-        packets_sent=packets_sent,
-        mae=mae,
-    )
+
+def _simulate_stepwise(
+    policy: BasePolicy,
+    cfg: NodeConfig,
+    energy: EnergyModel,
+    t_s: np.ndarray,
+    include_history: bool,
+    dtype: DTypeLike,
+) -> SimResult:
+    """Generic tick-by-tick loop driven by policy.step()."""
+    policy.reset()
+
+    n = len(t_s)
+    truth, noise, truth0 = _signal(cfg, t_s, dtype)
+    measured: Optional[np.ndarray] = None
+    sent: Optional[np.ndarray] = None
+    reconstructed: Optional[np.ndarray] = None
+    if include_history:
+        measured = np.full(n, np.nan, dtype=dtype)  # NaN = no sample this step
+        sent = np.zeros(n, dtype=np.bool_)
+        reconstructed = np.empty(n, dtype=dtype)
+
+    last_measurement: Optional[float] = None
+    last_tx_s: Optional[int] = None
+
+    # Energy follows from these counts once the loop is done
+    awake_steps = 0
+    samples_taken = 0
+    packets_sent = 0
+    abs_err_sum = np.float64(0.0)  # float32 inputs must not narrow the sum
+
+    # reconstruction: start at truth(0)
+    recon_val = float(truth0)
+
+    for i in range(n):
+        now_s = int(t_s[i])
+        gt = truth[i]
+
+        flags = policy.step(now_s, last_measurement, last_tx_s)
+
+        if flags & AWAKE:
+            awake_steps += 1
+
+            if flags & TAKE_SAMPLE:
+                # Sense + CPU; step() gets a Python float, not a float32 scalar
+                last_measurement = float(gt + noise[i])
+                if measured is not None:
+                    measured[i] = last_measurement
+                samples_taken += 1
+
+            if (flags & TRANSMIT) and last_measurement is not None:
+                # Transmit latest measurement
+                packets_sent += 1
+                last_tx_s = now_s
+                recon_val = last_measurement
+                if sent is not None:
+                    sent[i] = True
+
+        abs_err_sum += abs(gt - recon_val)
+        if reconstructed is not None:
+            reconstructed[i] = recon_val
+
+    breakdown = {
+        "sleep": (n - awake_steps) * energy.e_sleep(cfg.dt_s),
+        "idle_awake": awake_steps * energy.e_idle_awake(cfg.dt_s),
+        "sensing": samples_taken * energy.e_sense(),
+        "cpu": samples_taken * energy.e_cpu(),
+        "tx": packets_sent * energy.e_tx(cfg.payload_bytes),
+    }
+    mae = abs_err_sum / max(1, n)
+    if not include_history:
+        return _make_result(None, None, None, None, None, breakdown, samples_taken, packets_sent, mae)
+    return _make_result(t_s, truth, measured, sent, reconstructed, breakdown, samples_taken, packets_sent, mae)
+
+
+def _defining_class(policy: BasePolicy, attr: str) -> type:
+    return next(k for k in type(policy).__mro__ if attr in k.__dict__)
+
+
+def _uses_adaptive_kernel(policy: BasePolicy) -> bool:
+    """True if the compiled kernel reproduces policy.step() exactly."""
+    return type(policy).step is AdaptiveThresholdPolicy.step
+
+
+def _uses_schedule(policy: BasePolicy) -> bool:
+    """True if policy.schedule() comes from the class that defines its step()."""
+    return _defining_class(policy, "schedule") is _defining_class(policy, "step")
+
+
+def _time_axis(cfg: NodeConfig) -> np.ndarray:
+    steps = int(cfg.duration_s / cfg.dt_s)
+    return np.rint(np.arange(steps + 1) * cfg.dt_s).astype(np.int64)
+
+
+def simulate(
+    policy: BasePolicy,
+    cfg: NodeConfig,
+    energy: EnergyModel,
+    include_history: bool = True,
+    dtype: DTypeLike = np.float32,
+) -> SimResult:
+    """Run the simulation.
+
+    Notes:
+    - Discrete time simulation with step dt_s (default 1s).
+    - When the node is asleep, no sensing/CPU/tx occurs.
+    - Energy is accumulated per time step + per action.
+    - Policies that provide a closed-form schedule() (fixed, duty) are
+      evaluated on whole NumPy arrays; the adaptive policy runs in a
+      compiled sequential kernel (numba, if installed); any other policy is
+      stepped one tick at a time through its step() method.
+    - With include_history=False only the aggregates (energy, counters,
+      MAE) are kept; the per-step series in the result are None.
+    - Signal series (truth, noise, measured, reconstructed) are stored as
+      `dtype` (float32 by default; pass np.float64 for full precision).
+      Energy totals and the MAE are always accumulated in float64.
+    """
+    t_s = _time_axis(cfg)
+    if _uses_adaptive_kernel(policy):
+        return _simulate_adaptive(policy, cfg, energy, t_s, include_history, dtype)
+    masks = policy.schedule(t_s) if _uses_schedule(policy) else None
+    if masks is not None:
+        return _simulate_vectorized(cfg, energy, t_s, *masks, include_history, dtype)
+
+    return _simulate_stepwise(policy, cfg, energy, t_s, include_history, dtype)
+
+
+@njit(cache=True, parallel=True)
+def _simulate_adaptive_batch_core(
+    offsets,
+    t_s,
+    truth,
+    noise,
+    base_every_s,
+    threshold,
+    max_silence_s,
+    recon0,
+):
+    """Run _simulate_adaptive_core for many independent runs in parallel.
+
+    The runs' series are concatenated into flat arrays; run k occupies
+    [offsets[k], offsets[k + 1]) and may be empty. Returns per-run
+    (samples, packets, abs_err_sum).
+    """
+    n_runs = base_every_s.shape[0]
+    samples = np.zeros(n_runs, dtype=np.int64)
+    packets = np.zeros(n_runs, dtype=np.int64)
+    abs_err = np.zeros(n_runs, dtype=np.float64)
+    for k in prange(n_runs):
+        a = offsets[k]
+        b = offsets[k + 1]
+        _, samples[k], packets[k], abs_err[k] = _simulate_adaptive_core(
+            t_s[a:b],
+            truth[a:b],
+            noise[a:b],
+            base_every_s[k],
+            threshold[k],
+            max_silence_s[k],
+            recon0[k],
+            False,
+        )
+    return samples, packets, abs_err
+
+
+def simulate_batch(
+    policies: Sequence[BasePolicy],
+    cfgs: Sequence[NodeConfig],
+    energies: Sequence[EnergyModel],
+    include_history: bool = False,
+    dtype: DTypeLike = np.float32,
+) -> list[SimResult]:
+    """Run many independent simulations, e.g. a sweep over seeds or policies.
+
+    policies[k], cfgs[k] and energies[k] describe run k. Aggregate-only
+    adaptive runs are executed together in one multithreaded numba kernel;
+    every other run goes through simulate(). Results are returned in input
+    order.
+    """
+    if not (len(policies) == len(cfgs) == len(energies)):
+        raise ValueError("policies, cfgs and energies must have the same length")
+
+    batched = [k for k, policy in enumerate(policies) if _uses_adaptive_kernel(policy) and not include_history]
+    batched_results: dict[int, SimResult] = {}
+    if batched:
+        t_parts = [_time_axis(cfgs[k]) for k in batched]
+        signals = [_signal(cfgs[k], t, dtype) for k, t in zip(batched, t_parts)]
+        offsets = np.zeros(len(batched) + 1, dtype=np.int64)
+        np.cumsum([len(t) for t in t_parts], out=offsets[1:])
+        samples, packets, abs_err = _simulate_adaptive_batch_core(
+            offsets,
+            np.concatenate(t_parts),
+            np.concatenate([truth for truth, _, _ in signals]),
+            np.concatenate([noise for _, noise, _ in signals]),
+            np.array([policies[k].base_every_s for k in batched], dtype=np.int64),
+            np.array([policies[k].threshold for k in batched], dtype=np.float64),
+            np.array([policies[k].max_silence_s for k in batched], dtype=np.int64),
+            np.array([truth0 for _, _, truth0 in signals], dtype=np.float64),
+        )
+        empty = np.empty(0, dtype=np.bool_)
+        for j, k in enumerate(batched):
+            truth, noise, truth0 = signals[j]
+            batched_results[k] = _adaptive_result(
+                policies[k], cfgs[k], energies[k], t_parts[j], truth, noise, truth0, empty,
+                int(samples[j]), int(packets[j]), float(abs_err[j]), False,
+            )
+
+    return [
+        batched_results[k] if k in batched_results
+        else simulate(policies[k], cfgs[k], energies[k], include_history=include_history, dtype=dtype)
+        for k in range(len(policies))
+    ]